@@ -0,0 +1,114 @@
+from typing import Any, Dict, Optional, Tuple
+import functools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60
+
+
+def _cache_ttl() -> int:
+    value = os.environ.get('MCP_SERVER_YOUTUBE_CACHE_TTL')
+    if value is None:
+        return DEFAULT_CACHE_TTL
+    try:
+        return int(value)
+    except ValueError:
+        print(
+            f"Ignoring invalid MCP_SERVER_YOUTUBE_CACHE_TTL={value!r}, using {DEFAULT_CACHE_TTL}",
+            file=sys.stderr,
+        )
+        return DEFAULT_CACHE_TTL
+
+
+# seconds a cached transcript stays fresh, 0 disables the cache
+CACHE_TTL = _cache_ttl()
+
+# the connection is shared by the worker threads the server calls in from
+_lock = threading.Lock()
+
+
+def cache_path() -> Path:
+    """
+    Location of the transcript cache database
+    Returns:
+        Path: $XDG_CACHE_HOME/mcp-server-youtube/transcripts.db, defaulting to ~/.cache
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(cache_home) / 'mcp-server-youtube' / 'transcripts.db'
+
+
+@functools.lru_cache(maxsize=None)
+def _connect() -> sqlite3.Connection:
+    path = cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transcripts (
+            video_id TEXT NOT NULL,
+            raw INTEGER NOT NULL,
+            transcript TEXT NOT NULL,
+            metadata_json TEXT NOT NULL,
+            fetched_at INTEGER NOT NULL,
+            PRIMARY KEY (video_id, raw)
+        )
+    """)
+    return conn
+
+
+def get_cached_transcript(video_id: str, raw: bool) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Look up a previously fetched transcript
+    Args:
+        video_id (str): YouTube video ID
+        raw (bool): Whether the raw or the cleaned transcript is wanted
+    Returns:
+        A (transcript, metadata) tuple, or None on a miss, an expired entry or an unusable cache
+    """
+    if CACHE_TTL <= 0:
+        return None
+    try:
+        with _lock:
+            row = _connect().execute(
+                "SELECT transcript, metadata_json FROM transcripts"
+                " WHERE video_id = ? AND raw = ? AND fetched_at > ?",
+                (video_id, int(raw), int(time.time()) - CACHE_TTL),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"Transcript cache unavailable: {e}", file=sys.stderr)
+        return None
+
+
+def put_cached_transcript(
+    video_id: str, raw: bool, transcript: str, metadata: Dict[str, Any]
+) -> None:
+    """
+    Store a fetched transcript, replacing any previous entry for the same video and dropping expired ones
+    Args:
+        video_id (str): YouTube video ID
+        raw (bool): Whether transcript is the raw or the cleaned transcript
+        transcript (str): Transcript text
+        metadata (dict): Video metadata
+    """
+    if CACHE_TTL <= 0:
+        return
+    now = int(time.time())
+    try:
+        with _lock:
+            conn = _connect()
+            with conn:
+                conn.execute("DELETE FROM transcripts WHERE fetched_at <= ?", (now - CACHE_TTL,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?)",
+                    (video_id, int(raw), transcript, json.dumps(metadata), now),
+                )
+    except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+        print(f"Transcript cache unavailable: {e}", file=sys.stderr)
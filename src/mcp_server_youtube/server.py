@@ -1,4 +1,6 @@
-from typing import Annotated, Dict, Any
+from typing import Annotated, Dict, Any, Iterable, Iterator, Tuple
+import asyncio
+import contextlib
 import re
 from urllib.parse import urlparse, parse_qs
 import signal
@@ -20,8 +22,38 @@ from mcp.types import (
     INTERNAL_ERROR,
 )
 from pydantic import BaseModel, Field, AnyUrl
+import httpx
 import yt_dlp
 
+from .cache import get_cached_transcript, put_cached_transcript
+
+
+# lines starting with a timestamp like 00:00:00.320
+_TS_LINE = re.compile(r'\d{2}:\d{2}:\d{2}\.\d{3}')
+
+# inline timestamps like <00:00:00.320>
+_INLINE_TS = re.compile(r'<\d{2}:\d{2}:\d{2}\.\d{3}>')
+
+# HTML tags like <c> or </c>
+_HTML_TAG = re.compile(r'<[^>]*>')
+
+_VIDEO_ID = re.compile(r'[A-Za-z0-9_-]{11}')
+
+
+def _caption_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield stripped caption lines, skipping VTT headers, cue numbers, cue timings and timestamps"""
+    for line in lines:
+        line = line.strip()
+        # cheapest and most selective checks first, cue timings are most of the skipped lines
+        if not line or '-->' in line:
+            continue
+        first = line[0]
+        if first.isdigit() and (line.isdigit() or _TS_LINE.match(line)):
+            continue
+        if first in 'WKL' and line.startswith(('WEBVTT', 'Kind:', 'Language:')):
+            continue
+        yield line
+
 
 def clean_transcript_text(text: str) -> str:
     """
@@ -31,46 +63,95 @@ def clean_transcript_text(text: str) -> str:
     Returns:
         str: Cleaned transcript text with formatting removed and whitespace normalized
     """
-    lines = text.split('\n')
-    cleaned_lines = []
+    cleaned_text = ' '.join(_caption_lines(text.split('\n')))
     
-    for line in lines:
-        line = line.strip()
-        if (not line or 
-            line.startswith('WEBVTT') or 
-            line.startswith('Kind:') or
-            line.startswith('Language:') or
-            '-->' in line or
-            line.isdigit() or
-            re.match(r'^\d{2}:\d{2}:\d{2}\.\d{3}', line)):
-            continue
-        cleaned_lines.append(line)
-    
-    cleaned_text = ' '.join(cleaned_lines)
-    
-    # remove inline timestamps like <00:00:00.320>
-    cleaned_text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}>', '', cleaned_text)
-    
-    # remove HTML tags like <c> or </c>
-    cleaned_text = re.sub(r'<[^>]*>', '', cleaned_text)
+    # timestamps go first so a stray '<' in the text can't pair with a timestamp's '>'
+    cleaned_text = _INLINE_TS.sub('', cleaned_text)
+    cleaned_text = _HTML_TAG.sub('', cleaned_text)
     
-    # replace multiple spaces with single space
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
-    return cleaned_text.strip()
+    # split() with no arguments drops every whitespace run, collapsing them in C
+    return ' '.join(cleaned_text.split())
 
 
-async def get_youtube_transcript_and_metadata(
-    url: str, raw: bool = False
-) -> Dict[str, Any]:
+def extract_video_id(url: str) -> str | None:
     """
-    Fetch YouTube video transcript and metadata using yt-dlp
+    Extract the video ID from a YouTube URL
     Args:
-        url (str): The YouTube video URL to fetch transcript and metadata from
-        raw (bool, optional): If True, returns the raw transcript without cleaning. 
+        url (str): A youtube.com/watch, youtube.com/shorts, youtube.com/embed, youtube.com/live,
+            youtube-nocookie.com/embed or youtu.be URL, with or without its scheme, or a bare video ID
     Returns:
-        A dictionary containing transcript, metadata, and length
+        str: The 11 character video ID, or None if it could not be found
     """
+    url = url.strip()
+    if _VIDEO_ID.fullmatch(url):
+        return url
+    try:
+        parsed = urlparse(url)
+        if not parsed.scheme:
+            # e.g. youtube.com/watch?v=... or www.youtube.com/... as typed by hand
+            parsed = urlparse('https://' + url.lstrip('/'))
+        host = (parsed.hostname or '').lower()
+    except ValueError:
+        # malformed netloc, e.g. an unclosed IPv6 bracket
+        return None
+    video_id = ''
+    if host == 'youtu.be':
+        video_id = parsed.path.lstrip('/').split('/')[0]
+    elif host in ('youtube.com', 'youtube-nocookie.com') or host.endswith(('.youtube.com', '.youtube-nocookie.com')):
+        parts = parsed.path.strip('/').split('/')
+        if parts[0] == 'watch':
+            video_id = parse_qs(parsed.query).get('v', [''])[0]
+        elif len(parts) > 1 and parts[0] in ('shorts', 'embed', 'live', 'v'):
+            video_id = parts[1]
+    return video_id if _VIDEO_ID.fullmatch(video_id) else None
+
+
+def new_http_client() -> httpx.AsyncClient:
+    """Create the HTTP client used for subtitle downloads"""
+    return httpx.AsyncClient(timeout=30, follow_redirects=True)
+
 
+def vtt_candidates(
+    subtitles: Dict[str, list], automatic_captions: Dict[str, list], preferred_languages: list[str]
+) -> list[Dict[str, Any]]:
+    """
+    Collect VTT subtitle URLs in order of preference
+    Args:
+        subtitles (dict): Manual subtitle formats keyed by language, as returned by yt-dlp
+        automatic_captions (dict): Automatic caption formats keyed by language, as returned by yt-dlp
+        preferred_languages (list): Languages to consider, in order of preference
+    Returns:
+        list: The first VTT format of each preferred language, manual subtitles before automatic captions
+    """
+    candidates = []
+    for tracks in (subtitles, automatic_captions):
+        for lang in preferred_languages:
+            for sub in tracks.get(lang) or []:
+                if sub.get('ext') == 'vtt':
+                    candidates.append(sub)
+                    break
+    return candidates
+
+
+def _subtitle_headers(ydl: yt_dlp.YoutubeDL, sub: Dict[str, Any]) -> httpx.Headers:
+    """Headers yt-dlp itself would send for a subtitle download: its browser headers and cookies"""
+    headers = httpx.Headers(ydl.params['http_headers'])
+    headers.update(sub.get('http_headers') or {})
+    # the cookie jar may hold consent cookies set during extract_info
+    cookie = ydl.cookiejar.get_cookie_header(sub['url'])
+    if cookie:
+        headers['Cookie'] = cookie
+    return headers
+
+
+def extract_video(url: str) -> Tuple[Dict[str, Any], list[Tuple[str, httpx.Headers]]]:
+    """
+    Run yt-dlp on a video and keep only what the server needs from its info dict
+    Args:
+        url (str): The YouTube video URL
+    Returns:
+        A (metadata, subtitle requests) tuple, each request a (URL, headers) pair ordered as by vtt_candidates
+    """
     ydl_opts = {
         'writesubtitles': True,
         'writeautomaticsub': True,
@@ -78,68 +159,130 @@ async def get_youtube_transcript_and_metadata(
         'quiet': True,
         'no_warnings': True,
     }
-    
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        # the full info dict holds every format and thumbnail, don't let it escape
+        info = ydl.extract_info(url, download=False)
+
+        subtitles = info.get('subtitles', {})
+        automatic_captions = info.get('automatic_captions', {})
+        preferred_languages = ['en', 'en-US', 'en-GB', 'en-orig']
+
+        # Debug: see what languages are available
+        print(f"Subtitles keys: {list(subtitles.keys())}", file=sys.stderr)
+        print(f"Auto caption keys: {list(automatic_captions.keys())}", file=sys.stderr)
+
+        subtitle_requests = [
+            (sub['url'], _subtitle_headers(ydl, sub))
+            for sub in vtt_candidates(subtitles, automatic_captions, preferred_languages)
+        ]
+
+    metadata = {
+        'title': info.get('title', 'Unknown Title'),
+        'uploader': info.get('uploader', 'Unknown Uploader'),
+        'upload_date': info.get('upload_date', 'Unknown Date'),
+        'duration': info.get('duration', 0),
+        'view_count': info.get('view_count', 0),
+        'description': info.get('description', ''),
+    }
+
+    return metadata, subtitle_requests
+
+
+async def download_first(
+    client: httpx.AsyncClient, requests: list[Tuple[str, httpx.Headers]]
+) -> str | None:
+    """
+    Download URLs one at a time in order of preference, stopping at the first success
+    Args:
+        client (httpx.AsyncClient): Client to download with
+        requests (list): (URL, headers) pairs to download, in order of preference
+    Returns:
+        str: Body of the most preferred non-empty successful response decoded as UTF-8,
+            or None if every download succeeded but was empty
+    Raises:
+        McpError: If no download succeeded and at least one failed, with the last failure
+    """
+    error = None
+    # serially, so the usual case is a single request to the rate-limited subtitle endpoint
+    for url, headers in requests:
+        try:
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            error = f"HTTP Error {e.response.status_code}: {e.response.reason_phrase}"
+            continue
+        except httpx.HTTPError as e:
+            error = str(e) or type(e).__name__
+            continue
+        if response.content:
+            return response.content.decode('utf-8')
+
+    if error is not None:
+        raise McpError(ErrorData(
+            code=INTERNAL_ERROR,
+            message=f"Failed to fetch YouTube transcript: {error}"
+        ))
+    return None
+
+
+async def get_youtube_transcript_and_metadata(
+    url: str, raw: bool = False, client: httpx.AsyncClient | None = None
+) -> Dict[str, Any]:
+    """
+    Fetch YouTube video transcript and metadata using yt-dlp
+    Args:
+        url (str): The YouTube video URL to fetch transcript and metadata from
+        raw (bool, optional): If True, returns the raw transcript without cleaning. 
+        client (httpx.AsyncClient, optional): Client for subtitle downloads, a temporary one is used if omitted
+    Returns:
+        A dictionary containing transcript, metadata, and length
+    """
+
+    video_id = extract_video_id(url)
+    if not video_id:
+        raise McpError(ErrorData(
+            code=INVALID_PARAMS,
+            message=f"Not a YouTube video URL: {url}"
+        ))
+    # every URL variant of a video shares one cache entry and one yt-dlp code path
+    url = f"https://www.youtube.com/watch?v={video_id}"
+
+    # the cache does disk I/O, keep it off the event loop too
+    cached = await asyncio.to_thread(get_cached_transcript, video_id, raw)
+    if cached:
+        transcript, metadata = cached
+        return {
+            'transcript': transcript,
+            'metadata': metadata,
+            'length': len(transcript),
+        }
+
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            
-            metadata = {
-                'title': info.get('title', 'Unknown Title'),
-                'uploader': info.get('uploader', 'Unknown Uploader'),
-                'upload_date': info.get('upload_date', 'Unknown Date'),
-                'duration': info.get('duration', 0),
-                'view_count': info.get('view_count', 0),
-                'description': info.get('description', ''),
-            }
-            
-            subtitles = info.get('subtitles', {})
-            automatic_captions = info.get('automatic_captions', {})
-            transcript_text = ""
-            preferred_languages = ['en', 'en-US', 'en-GB', 'en-orig']
-
-            # Debug: see what languages are available
-            print(f"Subtitles keys: {list(subtitles.keys())}", file=sys.stderr)
-            print(f"Auto caption keys: {list(automatic_captions.keys())}", file=sys.stderr)
-            
-            # First try manual subtitles
-            for lang in preferred_languages:
-                if lang in subtitles:
-                    subtitle_info = subtitles[lang]
-                    if subtitle_info:
-                        # prefer vtt
-                        for sub in subtitle_info:
-                            if sub.get('ext') == 'vtt':
-                                transcript_text = ydl.urlopen(sub['url']).read().decode('utf-8')
-                                break
-                        if transcript_text:
-                            break
-            
-            # If no manual subtitles, try automatic captions
-            if not transcript_text:
-                for lang in preferred_languages:
-                    if lang in automatic_captions:
-                        caption_info = automatic_captions[lang]
-                        if caption_info:
-                            for sub in caption_info:
-                                if sub.get('ext') == 'vtt':
-                                    transcript_text = ydl.urlopen(sub['url']).read().decode('utf-8')
-                                    break
-                            if transcript_text:
-                                break
-            
-            if not transcript_text:
-                raise McpError(ErrorData(
-                    code=INTERNAL_ERROR, 
-                    message="No transcript/subtitles available for this video"
-                ))
-            
-            cleaned_transcript = transcript_text if raw else clean_transcript_text(transcript_text)
-            
-            return {
-                'transcript': cleaned_transcript,
-                'metadata': metadata,
-                'original_length': len(cleaned_transcript),
-            }
+        # extract_info is blocking network and parsing work, keep it off the event loop
+        metadata, subtitle_requests = await asyncio.to_thread(extract_video, url)
+        
+        async with (contextlib.nullcontext(client) if client else new_http_client()) as http_client:
+            transcript_text = await download_first(http_client, subtitle_requests)
+        
+        if transcript_text is None:
+            raise McpError(ErrorData(
+                code=INTERNAL_ERROR, 
+                message="No transcript/subtitles available for this video"
+            ))
+        
+        # cleaning is a CPU-bound regex pass over the whole transcript
+        cleaned_transcript = (
+            transcript_text if raw
+            else await asyncio.to_thread(clean_transcript_text, transcript_text)
+        )
+        
+        await asyncio.to_thread(put_cached_transcript, video_id, raw, cleaned_transcript, metadata)
+        
+        return {
+            'transcript': cleaned_transcript,
+            'metadata': metadata,
+            'length': len(cleaned_transcript),
+        }
             
     except Exception as e:
         if isinstance(e, McpError):
@@ -163,13 +306,57 @@ class Youtube(BaseModel):
     ]
 
 
+# tool and prompt listings never change, build them once instead of on every request
+_YOUTUBE_SCHEMA = Youtube.model_json_schema()
+
+_GET_YOUTUBE_DESC = (
+    "Fetches a YouTube video transcript and metadata.\n"
+    "This tool can retrieve full transcripts (subtitles) from YouTube videos along with metadata\n"
+    "like title, uploader, and upload date. It automatically cleans up VTT formatting to reduce\n"
+    "token usage unless raw format is requested. Returns the complete transcript without truncation."
+)
+
+_PROMPT_OBJ = Prompt(
+    name="get_youtube",
+    description="Fetch a YouTube video transcript and metadata",
+    arguments=[
+        PromptArgument(
+            name="url", description="YouTube video URL to fetch", required=True
+        )
+    ],
+)
+
+_RESPONSE_TEMPLATE = textwrap.dedent("""
+    **Video Information:**
+    - Title: {title}
+    - Uploader: {uploader}
+    - Upload Date: {upload_date}
+    - Duration: {duration} seconds
+    - View Count: {view_count}
+
+    **Transcript:**
+    {transcript}
+""").strip()
+
+_PROMPT_TEMPLATE = textwrap.dedent("""
+    Video: {title}
+    Uploader: {uploader}
+    Upload Date: {upload_date}
+
+    Transcript:
+    {transcript}
+""").strip()
+
+
+def signal_handler(signum, frame):
+    print("Received signal to terminate", file=sys.stderr)
+    sys.exit(0)
+
+
 async def serve() -> None:
     """Run the YouTube transcript MCP server."""
     server = Server("mcp-server-youtube")
-
-    def signal_handler(signum, frame):
-        print("Received signal to terminate", file=sys.stderr)
-        sys.exit(0)
+    http_client = new_http_client()
 
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
@@ -177,31 +364,12 @@ async def serve() -> None:
     @server.list_tools()
     async def list_tools() -> list[Tool]:
         return [
-            Tool(
-                name="get_youtube",
-                description=textwrap.dedent("""
-                    Fetches a YouTube video transcript and metadata.
-                    This tool can retrieve full transcripts (subtitles) from YouTube videos along with metadata
-                    like title, uploader, and upload date. It automatically cleans up VTT formatting to reduce
-                    token usage unless raw format is requested. Returns the complete transcript without truncation.
-                """).strip(),
-                inputSchema=Youtube.model_json_schema(),
-            )
+            Tool(name="get_youtube", description=_GET_YOUTUBE_DESC, inputSchema=_YOUTUBE_SCHEMA)
         ]
 
     @server.list_prompts()
     async def list_prompts() -> list[Prompt]:
-        return [
-            Prompt(
-                name="get_youtube",
-                description="Fetch a YouTube video transcript and metadata",
-                arguments=[
-                    PromptArgument(
-                        name="url", description="YouTube video URL to fetch", required=True
-                    )
-                ],
-            )
-        ]
+        return [_PROMPT_OBJ]
 
     @server.call_tool()
     async def call_tool(name, arguments: dict) -> list[TextContent]:
@@ -218,23 +386,20 @@ async def serve() -> None:
             raise McpError(ErrorData(code=INVALID_PARAMS, message="URL is required"))
 
         result = await get_youtube_transcript_and_metadata(
-            url, raw=args.raw
+            url, raw=args.raw, client=http_client
         )
         
         # Format the response
         metadata = result['metadata']
         transcript = result['transcript']
-        formatted_response = textwrap.dedent(f"""
-            **Video Information:**
-            - Title: {metadata['title']}
-            - Uploader: {metadata['uploader']}
-            - Upload Date: {metadata['upload_date']}
-            - Duration: {metadata['duration']} seconds
-            - View Count: {metadata.get('view_count', 'N/A')}
-
-            **Transcript:**
-            {transcript}
-        """).strip()
+        formatted_response = _RESPONSE_TEMPLATE.format(
+            title=metadata['title'],
+            uploader=metadata['uploader'],
+            upload_date=metadata['upload_date'],
+            duration=metadata['duration'],
+            view_count=metadata.get('view_count', 'N/A'),
+            transcript=transcript,
+        )
         
         return [TextContent(type="text", text=formatted_response)]
 
@@ -249,18 +414,16 @@ async def serve() -> None:
         url = arguments["url"]
 
         try:
-            result = await get_youtube_transcript_and_metadata(url)
+            result = await get_youtube_transcript_and_metadata(url, client=http_client)
             metadata = result['metadata']
             transcript = result['transcript']
             
-            formatted_content = textwrap.dedent(f"""
-                Video: {metadata['title']}
-                Uploader: {metadata['uploader']}
-                Upload Date: {metadata['upload_date']}
-
-                Transcript:
-                {transcript}
-            """).strip()
+            formatted_content = _PROMPT_TEMPLATE.format(
+                title=metadata['title'],
+                uploader=metadata['uploader'],
+                upload_date=metadata['upload_date'],
+                transcript=transcript,
+            )
             
             return GetPromptResult(
                 description=f"YouTube transcript for: {metadata['title']}",
@@ -283,5 +446,5 @@ async def serve() -> None:
             )
 
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
+    async with http_client, stdio_server() as (read_stream, write_stream):
         await server.run(read_stream, write_stream, options, raise_exceptions=True)
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from mcp_server_youtube import cache
+
+VIDEO_ID = "dQw4w9WgXcQ"
+METADATA = {"title": "Never Gonna Give You Up", "channel": "Rick Astley"}
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(cache, "CACHE_TTL", 60)
+    cache._connect.cache_clear()
+    yield tmp_path
+    if cache._connect.cache_info().currsize:
+        cache._connect().close()
+    cache._connect.cache_clear()
+
+
+def test_round_trip(cache_home):
+    cache.put_cached_transcript(VIDEO_ID, False, "hello world", METADATA)
+    assert cache.get_cached_transcript(VIDEO_ID, False) == ("hello world", METADATA)
+    assert cache.cache_path() == cache_home / "mcp-server-youtube" / "transcripts.db"
+
+
+def test_miss():
+    assert cache.get_cached_transcript(VIDEO_ID, False) is None
+
+
+def test_keyed_by_raw():
+    cache.put_cached_transcript(VIDEO_ID, True, "WEBVTT\n\nhello", METADATA)
+    assert cache.get_cached_transcript(VIDEO_ID, False) is None
+
+    cache.put_cached_transcript(VIDEO_ID, False, "hello", METADATA)
+    assert cache.get_cached_transcript(VIDEO_ID, True) == ("WEBVTT\n\nhello", METADATA)
+    assert cache.get_cached_transcript(VIDEO_ID, False) == ("hello", METADATA)
+
+
+def test_expiry(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now)
+    cache.put_cached_transcript(VIDEO_ID, False, "hello", METADATA)
+
+    monkeypatch.setattr(cache.time, "time", lambda: now + 59)
+    assert cache.get_cached_transcript(VIDEO_ID, False) == ("hello", METADATA)
+
+    monkeypatch.setattr(cache.time, "time", lambda: now + 61)
+    assert cache.get_cached_transcript(VIDEO_ID, False) is None
+
+    # the next write drops the expired entry
+    cache.put_cached_transcript("a-b_c1234XY", False, "other", METADATA)
+    count = cache._connect().execute(
+        "SELECT COUNT(*) FROM transcripts WHERE video_id = ?", (VIDEO_ID,)
+    ).fetchone()[0]
+    assert count == 0
+
+
+def test_disabled(cache_home, monkeypatch):
+    monkeypatch.setenv("MCP_SERVER_YOUTUBE_CACHE_TTL", "0")
+    monkeypatch.setattr(cache, "CACHE_TTL", cache._cache_ttl())
+
+    cache.put_cached_transcript(VIDEO_ID, False, "hello", METADATA)
+    assert cache.get_cached_transcript(VIDEO_ID, False) is None
+    assert not cache.cache_path().exists()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, cache.DEFAULT_CACHE_TTL),
+        ("3600", 3600),
+        ("0", 0),
+        ("a week", cache.DEFAULT_CACHE_TTL),
+    ],
+)
+def test_cache_ttl_from_env(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("MCP_SERVER_YOUTUBE_CACHE_TTL", raising=False)
+    else:
+        monkeypatch.setenv("MCP_SERVER_YOUTUBE_CACHE_TTL", value)
+    assert cache._cache_ttl() == expected
+
+
+def test_corrupt_row_is_a_miss():
+    conn = cache._connect()
+    with conn:
+        conn.execute(
+            "INSERT INTO transcripts VALUES (?, ?, ?, ?, ?)",
+            (VIDEO_ID, 0, "hello", "{not json", int(time.time())),
+        )
+    assert cache.get_cached_transcript(VIDEO_ID, False) is None
@@ -0,0 +1,90 @@
+import pytest
+
+from mcp_server_youtube.server import clean_transcript_text, extract_video_id
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+VTT = """WEBVTT
+Kind: captions
+Language: en
+
+1
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+we're<00:00:00.320><c> no</c><00:00:00.640><c> strangers</c>
+
+2
+00:00:02.000 --> 00:00:04.000 align:start position:0%
+to<00:00:02.480><c> love</c>
+"""
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (f"https://www.youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+        (f"https://www.youtube.com/watch?v={VIDEO_ID}&t=42s&list=PL123", VIDEO_ID),
+        (f"https://www.youtube.com/watch?feature=share&v={VIDEO_ID}", VIDEO_ID),
+        (f"http://youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+        (f"https://m.youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+        (f"https://music.youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+        (f"https://youtu.be/{VIDEO_ID}", VIDEO_ID),
+        (f"https://youtu.be/{VIDEO_ID}?si=abc123", VIDEO_ID),
+        (f"https://www.youtube.com/shorts/{VIDEO_ID}", VIDEO_ID),
+        (f"https://www.youtube.com/embed/{VIDEO_ID}", VIDEO_ID),
+        (f"https://www.youtube.com/live/{VIDEO_ID}?feature=share", VIDEO_ID),
+        (f"https://www.youtube.com/v/{VIDEO_ID}", VIDEO_ID),
+        (f"https://www.youtube-nocookie.com/embed/{VIDEO_ID}", VIDEO_ID),
+        (f"HTTPS://WWW.YOUTUBE.COM/watch?v={VIDEO_ID}", VIDEO_ID),
+        # no scheme
+        (f"youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+        (f"www.youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+        (f"youtu.be/{VIDEO_ID}", VIDEO_ID),
+        (f"//www.youtube.com/shorts/{VIDEO_ID}", VIDEO_ID),
+        # bare video ID
+        (VIDEO_ID, VIDEO_ID),
+        (f"  {VIDEO_ID}\n", VIDEO_ID),
+        ("a-b_c1234XY", "a-b_c1234XY"),
+    ],
+)
+def test_extract_video_id(url, expected):
+    assert extract_video_id(url) == expected
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "",
+        "https://www.youtube.com/",
+        "https://www.youtube.com/watch",
+        "https://www.youtube.com/watch?v=tooshort",
+        f"https://www.youtube.com/watch?v={VIDEO_ID}x",
+        "https://www.youtube.com/watch?v=dQw4w9WgXc!",
+        f"https://www.youtube.com/channel/{VIDEO_ID}",
+        "https://www.youtube.com/shorts/",
+        f"https://evilyoutube.com/watch?v={VIDEO_ID}",
+        f"https://youtube.com.evil.example/watch?v={VIDEO_ID}",
+        f"https://example.com/watch?v={VIDEO_ID}",
+        f"https://example.com/{VIDEO_ID}",
+        "youtube.com",
+        "dQw4w9WgXc",
+        "http://[::1",
+        "[::1",
+    ],
+)
+def test_extract_video_id_rejects(url):
+    assert extract_video_id(url) is None
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (VTT, "we're no strangers to love"),
+        (VTT.replace("\n", "\r\n"), "we're no strangers to love"),
+        ("a < b <00:00:01.000>c", "a < b c"),
+        # only '\n' separates lines, other line boundaries are plain whitespace
+        ("hello\x0c\n42\x0cworld", "hello 42 world"),
+        ("", ""),
+    ],
+)
+def test_clean_transcript_text(text, expected):
+    assert clean_transcript_text(text) == expected